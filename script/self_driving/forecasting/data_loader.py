@@ -5,9 +5,9 @@ query trace producer.
 """
 
 import logging
-import csv
 from typing import List, Dict
 import numpy as np
+import pandas as pd
 
 
 class DataLoader:
@@ -46,16 +46,15 @@ class DataLoader:
         :return: Loaded 2D numpy array of [db_oid, query_id, timestamp]
         """
         logging.info(f"Loading data from {self._query_trace_file}")
-        # Load data from the files
-        with open(self._query_trace_file, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            data = np.array(
-                [[int(r['db_oid']), int(r[' query_id']), int(r[' timestamp'])] for r in reader])
+        # Load data from the files. Only the db_oid, query_id and timestamp columns are parsed, which also skips the
+        # free-form (and possibly comma-containing) parameters column
+        data = np.loadtxt(self._query_trace_file, dtype=np.int64, delimiter=',', skiprows=1,
+                          usecols=(self.DBOID_IDX, self.QID_IDX, self.TS_IDX), ndmin=2)
 
-            if len(data) == 0:
-                raise ValueError("Empty trace file")
+        if len(data) == 0:
+            raise ValueError("Empty trace file")
 
-            return data
+        return data
 
     def _to_timeseries(self, data: np.ndarray) -> None:
         """
@@ -75,19 +74,17 @@ class DataLoader:
         num_buckets = (end_timestamp - start_timestamp -
                        1) // self._interval_us + 1
 
-        # Iterate through the timestamps
-        self._ts_data = {}
-        for i in range(len(data)):
-            t = data[i][self.TS_IDX]
-            qid = data[i][self.QID_IDX]
+        # Bucket index of every query
+        bucket_ids = (data[:, self.TS_IDX] - start_timestamp) // self._interval_us
 
-            # Initialize a new query's time-series
-            if self._ts_data.get(qid) is None:
-                self._ts_data[qid] = np.zeros(num_buckets)
+        # Label every query with the position of its query id (ordered by first appearance in the trace) with a single
+        # hash pass
+        labels, qids = pd.factorize(data[:, self.QID_IDX])
 
-            # Bucket index
-            bi = (t - start_timestamp) // self._interval_us
-            self._ts_data[qid][bi] += 1
+        # Count the queries in every (query id, bucket) pair in a single pass
+        ts_matrix = np.zeros((len(qids), num_buckets))
+        np.add.at(ts_matrix, (labels, bucket_ids), 1)
+        self._ts_data = dict(zip(qids, ts_matrix))
 
     def get_ts_data(self) -> Dict:
         return self._ts_data
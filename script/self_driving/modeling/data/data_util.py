@@ -1,3 +1,23 @@
+import numpy as np
+import pandas as pd
+from pyarrow import csv as arrow_csv
+
+
+def read_csv(filename):
+    """Read a csv file into a DataFrame with the (multi-threaded) pyarrow csv reader
+
+    The values are trimmed by the pyarrow parser, so only the header names need the leading spaces stripped. They are
+    stripped before parsing and passed to the reader directly.
+
+    :param filename: the input csv file
+    :return: the DataFrame
+    """
+    with open(filename, "r") as f:
+        column_names = [name.strip() for name in f.readline().split(',')]
+    read_options = arrow_csv.ReadOptions(column_names=column_names, skip_rows=1)
+    return arrow_csv.read_csv(filename, read_options=read_options).to_pandas()
+
+
 def convert_string_to_numeric(value):
     """Break up a string that contains ";" to a list of values
 
@@ -22,3 +42,15 @@ def round_to_interval(time, interval):
     """
     return time - time % interval
 
+
+def group_rows_by_interval(times, interval):
+    """Group the row positions by the interval that their timestamps fall into
+
+    :param times: the array of timestamps in us
+    :param interval: in us
+    :return: (the interval start times, the list of row position arrays for each interval), both in the order that the
+             intervals first appear
+    """
+    codes, interval_times = pd.factorize(round_to_interval(times, interval))
+    rows = np.argsort(codes, kind='stable')
+    return interval_times, np.split(rows, np.cumsum(np.bincount(codes))[:-1])
@@ -42,7 +42,7 @@ def get_grouped_op_unit_data(filename, warmup_period, ee_sample_rate, txn_sample
 
 def _default_get_global_data(filename, sample_rate=100):
     # In the default case, the data does not need any pre-processing and the file name indicates the opunit
-    df = pd.read_csv(filename)
+    df = data_util.read_csv(filename)
     file_name = os.path.splitext(os.path.basename(filename))[0]
 
     x = df.iloc[:, :-data_info.instance.METRICS_OUTPUT_NUM].values
@@ -59,7 +59,7 @@ def _default_get_global_data(filename, sample_rate=100):
 
 def _txn_get_mini_runner_data(filename, txn_sample_rate):
     # In the default case, the data does not need any pre-processing and the file name indicates the opunit
-    df = pd.read_csv(filename)
+    df = data_util.read_csv(filename)
     file_name = os.path.splitext(os.path.basename(filename))[0]
 
     # prepending a column of ones as the base transaction data feature
@@ -67,50 +67,32 @@ def _txn_get_mini_runner_data(filename, txn_sample_rate):
     df = pd.concat([base_x, df], axis=1)
     x = df.iloc[:, :-data_info.instance.METRICS_OUTPUT_NUM].values
     y = df.iloc[:, -data_info.instance.OU_MODEL_TARGET_NUM:].values
-    start_times = df.iloc[:, data_info.instance.target_csv_index[data_info.instance.Target.START_TIME]].values
-    cpu_ids = df.iloc[:, data_info.instance.target_csv_index[data_info.instance.Target.CPU_ID]].values
+    start_times = df.iloc[:, data_info.instance.target_csv_index[Target.START_TIME]].values
+    cpu_ids = df.iloc[:, data_info.instance.target_csv_index[Target.CPU_ID]].values
 
     logging.info("Loaded file: {}".format(OpUnit[file_name.upper()]))
 
     interval = data_info.instance.CONTENDING_OPUNIT_INTERVAL
 
-    # Map from interval start time to the data in this interval
-    interval_x_map = {}
-    interval_y_map = {}
-    interval_cpu_id_map = {}
-    interval_start_time_map = {}
-    n = x.shape[0]
-    for i in tqdm.tqdm(list(range(n)), desc="Group data by interval"):
-        rounded_time = data_util.round_to_interval(start_times[i], interval)
-        if rounded_time not in interval_x_map:
-            interval_x_map[rounded_time] = []
-            interval_y_map[rounded_time] = []
-            interval_cpu_id_map[rounded_time] = []
-            interval_start_time_map[rounded_time] = []
-        interval_x_map[rounded_time].append(x[i])
-        interval_y_map[rounded_time].append(y[i])
-        interval_cpu_id_map[rounded_time].append(cpu_ids[i])
-        interval_start_time_map[rounded_time].append(start_times[i])
+    # Positions of the rows in every interval, so that the features and metrics can be gathered column-wise
+    _, interval_rows = data_util.group_rows_by_interval(start_times, interval)
 
     # Construct the new data
     opunit = OpUnit[file_name.upper()]
     data_list = []
-    for rounded_time in interval_x_map:
+    for rows in tqdm.tqdm(interval_rows, desc="Construct data by interval"):
         # Sum the features
-        x_new = np.sum(interval_x_map[rounded_time], axis=0)
+        x_new = np.sum(x[rows], axis=0)
         # Concatenate the number of different threads
-        x_new = np.concatenate((x_new, [len(set(interval_cpu_id_map[rounded_time]))]))
+        x_new = np.concatenate((x_new, [len(np.unique(cpu_ids[rows]))]))
         if txn_sample_rate > 0:
-            x_new *= 100 / txn_sample_rate
+            x_new = x_new * (100 / txn_sample_rate)
         # Change all the opunits in the group for this interval to be the new feature
         opunits = [(opunit, x_new)]
         # The prediction is the average behavior
-        y_new = np.average(interval_y_map[rounded_time], axis=0)
-        n = len(interval_x_map[rounded_time])
-        for i in range(n):
-            metrics = np.concatenate(([interval_start_time_map[rounded_time][i]],
-                                      [interval_cpu_id_map[rounded_time][i]],
-                                      y_new))
+        y_new = np.average(y[rows], axis=0)
+        for start_time, cpu_id in zip(start_times[rows], cpu_ids[rows]):
+            metrics = np.concatenate(([start_time], [cpu_id], y_new))
             data_list.append(GroupedOpUnitData("{}".format(file_name), opunits, metrics, txn_sample_rate))
 
     return data_list
@@ -118,7 +100,7 @@ def _txn_get_mini_runner_data(filename, txn_sample_rate):
 
 def _pipeline_get_grouped_op_unit_data(filename, warmup_period, ee_sample_rate):
     # Get the global running data for the execution engine
-    start_time = None
+    warmup_end_time = None
 
     data_list = []
     with open(filename, "r") as f:
@@ -127,14 +109,15 @@ def _pipeline_get_grouped_op_unit_data(filename, warmup_period, ee_sample_rate):
         features_vector_index = data_info.instance.raw_features_csv_index[ExecutionFeature.FEATURES]
         input_output_boundary = data_info.instance.raw_features_csv_index[data_info.instance.INPUT_OUTPUT_BOUNDARY]
         input_end_boundary = len(data_info.instance.input_csv_index)
+        start_time_index = data_info.instance.raw_target_csv_index[Target.START_TIME]
 
         for line in reader:
-            # extract the time
-            cpu_time = line[data_info.instance.raw_target_csv_index[Target.START_TIME]]
-            if start_time is None:
-                start_time = cpu_time
+            # extract the time, and drop the records within the warmup period before parsing the rest of the line
+            cpu_time = int(line[start_time_index])
+            if warmup_end_time is None:
+                warmup_end_time = cpu_time + warmup_period * 1000000
 
-            if int(cpu_time) - int(start_time) < warmup_period * 1000000:
+            if cpu_time < warmup_end_time:
                 continue
 
             sample_rate = ee_sample_rate
@@ -184,7 +167,7 @@ def _pipeline_get_grouped_op_unit_data(filename, warmup_period, ee_sample_rate):
 
 def _interval_get_grouped_op_unit_data(filename):
     # In the default case, the data does not need any pre-processing and the file name indicates the opunit
-    df = pd.read_csv(filename, skipinitialspace=True)
+    df = data_util.read_csv(filename)
     file_name = os.path.splitext(os.path.basename(filename))[0]
 
     x = df.iloc[:, :-data_info.instance.METRICS_OUTPUT_NUM].values
@@ -193,36 +176,28 @@ def _interval_get_grouped_op_unit_data(filename):
     cpu_ids = df.iloc[:, data_info.instance.target_csv_index[Target.CPU_ID]].values
     interval = data_info.instance.PERIODIC_OPUNIT_INTERVAL
 
-    # Map from interval start time to the data in this interval
-    interval_x_map = {}
-    interval_y_map = {}
-    interval_cpu_map = {}
-    n = x.shape[0]
-    for i in tqdm.tqdm(list(range(n)), desc="Group data by interval"):
-        rounded_time = data_util.round_to_interval(start_times[i], interval)
-        if rounded_time not in interval_x_map:
-            interval_x_map[rounded_time] = []
-            interval_y_map[rounded_time] = []
-        interval_x_map[rounded_time].append(x[i])
-        interval_y_map[rounded_time].append(y[i])
-        interval_cpu_map[rounded_time] = cpu_ids[i]
+    # Positions of the rows in every interval, so that the features and metrics can be gathered column-wise
+    interval_times, interval_rows = data_util.group_rows_by_interval(start_times, interval)
 
     # Construct the new data
     opunit = OpUnit[file_name.upper()]
     data_list = []
-    for rounded_time in interval_x_map:
+    for rounded_time, rows in tqdm.tqdm(zip(interval_times, interval_rows), total=len(interval_rows),
+                                        desc="Construct data by interval"):
         # Sum the features
-        x_new = np.sum(interval_x_map[rounded_time], axis=0)
+        x_new = np.sum(x[rows], axis=0)
+        n = len(rows)
         # Keep the interval parameter the same
         # TODO: currently the interval parameter is always the last. Change the hard-coding later
-        x_new[-1] /= len(interval_x_map[rounded_time])
+        x_new[-1] /= n
         # Change all the opunits in the group for this interval to be the new feature
         opunits = [(opunit, x_new)]
         # The prediction is the average behavior
-        y_new = np.average(interval_y_map[rounded_time], axis=0)
-        n = len(interval_x_map[rounded_time])
+        y_new = np.average(y[rows], axis=0)
+        # The cpu id of the last data in this interval is used for all
+        cpu_id = cpu_ids[rows[-1]]
         for i in range(n):
-            metrics = np.concatenate(([rounded_time + i * interval // n], [interval_cpu_map[rounded_time]], y_new))
+            metrics = np.concatenate(([rounded_time + i * interval // n], [cpu_id], y_new))
             data_list.append(GroupedOpUnitData("{}".format(file_name), opunits, metrics))
 
     return data_list
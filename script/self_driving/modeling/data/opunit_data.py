@@ -5,7 +5,6 @@ import numpy as np
 import pandas as pd
 import os
 import logging
-import tqdm
 import math
 
 from . import data_util
@@ -19,8 +18,7 @@ def write_extended_data(output_path, symbol, index_value_list, data_map):
     open(output_path, 'w').close()
 
     io_util.write_csv_result(output_path, symbol, index_value_list)
-    for key, value in data_map.items():
-        io_util.write_csv_result(output_path, key, value)
+    io_util.write_csv_results(output_path, data_map.items())
 
 
 def get_ou_runner_data(filename, model_results_path, txn_sample_rate, model_map={}, predict_cache={}, trim=0.2):
@@ -50,7 +48,7 @@ def get_ou_runner_data(filename, model_results_path, txn_sample_rate, model_map=
 
 def _default_get_ou_runner_data(filename):
     # In the default case, the data does not need any pre-processing and the file name indicates the opunit
-    df = pd.read_csv(filename, skipinitialspace=True)
+    df = data_util.read_csv(filename)
     headers = list(df.columns.values)
     data_info.instance.parse_csv_header(headers, False)
     file_name = os.path.splitext(os.path.basename(filename))[0]
@@ -63,7 +61,7 @@ def _default_get_ou_runner_data(filename):
 
 def _txn_get_ou_runner_data(filename, model_results_path, txn_sample_rate):
     # In the default case, the data does not need any pre-processing and the file name indicates the opunit
-    df = pd.read_csv(filename)
+    df = data_util.read_csv(filename)
     file_name = os.path.splitext(os.path.basename(filename))[0]
 
     # prepending a column of ones as the base transaction data feature
@@ -71,8 +69,8 @@ def _txn_get_ou_runner_data(filename, model_results_path, txn_sample_rate):
     df = pd.concat([base_x, df], axis=1)
     x = df.iloc[:, :-data_info.instance.METRICS_OUTPUT_NUM].values
     y = df.iloc[:, -data_info.instance.OU_MODEL_TARGET_NUM:].values
-    start_times = df.iloc[:, data_info.instance.TARGET_CSV_INDEX[data_info.instance.Target.START_TIME]].values
-    cpu_ids = df.iloc[:, data_info.instance.TARGET_CSV_INDEX[data_info.instance.Target.CPU_ID]].values
+    start_times = df.iloc[:, data_info.instance.target_csv_index[Target.START_TIME]].values
+    cpu_ids = df.iloc[:, data_info.instance.target_csv_index[Target.CPU_ID]].values
 
     logging.info("Loaded file: {}".format(OpUnit[file_name.upper()]))
 
@@ -82,49 +80,35 @@ def _txn_get_ou_runner_data(filename, model_results_path, txn_sample_rate):
 
     interval = data_info.instance.CONTENDING_OPUNIT_INTERVAL
 
-    # Map from interval start time to the data in this interval
-    interval_x_map = {}
-    interval_y_map = {}
-    interval_id_map = {}
-    n = x.shape[0]
-    for i in tqdm.tqdm(list(range(n)), desc="Group data by interval"):
-        rounded_time = data_util.round_to_interval(start_times[i], interval)
-        if rounded_time not in interval_x_map:
-            interval_x_map[rounded_time] = []
-            interval_y_map[rounded_time] = []
-            interval_id_map[rounded_time] = set()
-        interval_x_map[rounded_time].append(x[i])
-        interval_y_map[rounded_time].append(y[i])
-        interval_id_map[rounded_time].add(cpu_ids[i])
-
-    # Construct the new data
-    x_list = []
-    y_list = []
-    for rounded_time in interval_x_map:
-        # Sum the features
-        x_new = np.sum(interval_x_map[rounded_time], axis=0)
-        # Concatenate the number of different threads
-        x_new = np.concatenate((x_new, [len(interval_id_map[rounded_time])]))
-        if txn_sample_rate > 0:
-            x_new *= 100 / txn_sample_rate
-        x_list.append(x_new)
-        # The prediction is the average behavior
-        y_list.append(np.average(interval_y_map[rounded_time], axis=0))
-        io_util.write_csv_result(prediction_path, rounded_time, np.concatenate((x_list[-1], y_list[-1])))
-
-    return [OpUnitData(OpUnit[file_name.upper()], np.array(x_list), np.array(y_list))]
+    # Group the data by interval (keeping the order in which the intervals first appear)
+    rounded_times = data_util.round_to_interval(start_times, interval)
+    x_groups = pd.DataFrame(x).groupby(rounded_times, sort=False)
+
+    # Sum the features
+    x_sum = x_groups.sum()
+    # Concatenate the number of different threads
+    thread_nums = pd.Series(cpu_ids).groupby(rounded_times, sort=False).nunique()
+    x_new = np.column_stack((x_sum.values, thread_nums.values))
+    if txn_sample_rate > 0:
+        x_new = x_new * (100 / txn_sample_rate)
+    # The prediction is the average behavior
+    y_new = pd.DataFrame(y).groupby(rounded_times, sort=False).mean().values
+
+    io_util.write_csv_results(prediction_path, zip(x_sum.index.values, np.concatenate((x_new, y_new), axis=1)))
+
+    return [OpUnitData(OpUnit[file_name.upper()], x_new, y_new)]
 
 
 def _interval_get_ou_runner_data(filename, model_results_path):
     # In the default case, the data does not need any pre-processing and the file name indicates the opunit
-    df = pd.read_csv(filename, skipinitialspace=True)
+    df = data_util.read_csv(filename)
     headers = list(df.columns.values)
     data_info.instance.parse_csv_header(headers, False)
     file_name = os.path.splitext(os.path.basename(filename))[0]
 
     x = df.iloc[:, :-data_info.instance.METRICS_OUTPUT_NUM].values
     y = df.iloc[:, -data_info.instance.OU_MODEL_TARGET_NUM:].values
-    start_times = df.iloc[:, data_info.instance.RAW_TARGET_CSV_INDEX[Target.START_TIME]].values
+    start_times = df.iloc[:, data_info.instance.raw_target_csv_index[Target.START_TIME]].values
     logging.info("Loaded file: {}".format(OpUnit[file_name.upper()]))
 
     # change the data based on the interval for the periodically invoked operating units
@@ -133,33 +117,22 @@ def _interval_get_ou_runner_data(filename, model_results_path):
 
     interval = data_info.instance.PERIODIC_OPUNIT_INTERVAL
 
-    # Map from interval start time to the data in this interval
-    interval_x_map = {}
-    interval_y_map = {}
-    n = x.shape[0]
-    for i in tqdm.tqdm(list(range(n)), desc="Group data by interval"):
-        rounded_time = data_util.round_to_interval(start_times[i], interval)
-        if rounded_time not in interval_x_map:
-            interval_x_map[rounded_time] = []
-            interval_y_map[rounded_time] = []
-        interval_x_map[rounded_time].append(x[i])
-        interval_y_map[rounded_time].append(y[i])
-
-    # Construct the new data
-    x_list = []
-    y_list = []
-    for rounded_time in interval_x_map:
-        # Sum the features
-        x_new = np.sum(interval_x_map[rounded_time], axis=0)
-        # Keep the interval parameter the same
-        # TODO: currently the interval parameter is always the last. Change the hard-coding later
-        x_new[-1] /= len(interval_x_map[rounded_time])
-        x_list.append(x_new)
-        # The prediction is the average behavior
-        y_list.append(np.average(interval_y_map[rounded_time], axis=0))
-        io_util.write_csv_result(prediction_path, rounded_time, np.concatenate((x_list[-1], y_list[-1])))
-
-    return [OpUnitData(OpUnit[file_name.upper()], np.array(x_list), np.array(y_list))]
+    # Group the data by interval (keeping the order in which the intervals first appear)
+    rounded_times = data_util.round_to_interval(start_times, interval)
+    x_groups = pd.DataFrame(x).groupby(rounded_times, sort=False)
+
+    # Sum the features
+    x_sum = x_groups.sum()
+    x_new = x_sum.values.copy()
+    # Keep the interval parameter the same (assigning back in place keeps the dtype of the features)
+    # TODO: currently the interval parameter is always the last. Change the hard-coding later
+    x_new[:, -1] = x_new[:, -1] / x_groups.size().values
+    # The prediction is the average behavior
+    y_new = pd.DataFrame(y).groupby(rounded_times, sort=False).mean().values
+
+    io_util.write_csv_results(prediction_path, zip(x_sum.index.values, np.concatenate((x_new, y_new), axis=1)))
+
+    return [OpUnitData(OpUnit[file_name.upper()], x_new, y_new)]
 
 
 def _execution_get_ou_runner_data(filename, model_map, predict_cache, trim):
@@ -173,8 +146,10 @@ def _execution_get_ou_runner_data(filename, model_map, predict_cache, trim):
     """
 
     # Get the ou runner data for the execution engine
-    data_map = {}
-    raw_data_map = {}
+    # Map from the (opunit + features) key to its group id, and the group id and target of every record
+    key_group_map = {}
+    group_ids = []
+    raw_y_list = []
     input_output_boundary = math.nan
     with open(filename, "r") as f:
         reader = csv.reader(f, delimiter=",", skipinitialspace=True)
@@ -218,44 +193,58 @@ def _execution_get_ou_runner_data(filename, model_map, predict_cache, trim):
 
             # Record into predict_cache
             key = tuple([opunits[0][0]] + opunits[0][1])
-            if key not in raw_data_map:
-                raw_data_map[key] = []
-            raw_data_map[key].append(y_merged)
+            group_ids.append(key_group_map.setdefault(key, len(key_group_map)))
+            raw_y_list.append(y_merged)
+
+    if len(raw_y_list) == 0:
+        return []
 
-    # Postprocess the raw_data_map -> data_map
+    # Postprocess the raw data -> the prediction of every group
     # We need to do this here since we need to have seen all the data
     # before we can start pruning. This step is done here so dropped
     # data don't actually become a part of the model.
-    for key in raw_data_map:
-        len_vec = len(raw_data_map[key])
-        raw_data_map[key].sort(key=lambda x: x[-1])
-
-        # compute how much to trim
-        trim_side = trim * len_vec
-        low = int(math.ceil(trim_side))
-        high = len_vec - low
-        if low >= high:
-            # if bounds are bad, just take the median
-            raw_data_map[key] = np.median(raw_data_map[key], axis=0)
-        else:
-            # otherwise, x% trimmed mean
-            raw_data_map[key] = np.average(raw_data_map[key][low:high], axis=0)
-
-        # Expose the singular data point
-        opunit = key[0]
-        if opunit not in data_map:
-            data_map[opunit] = []
-
-        predict = raw_data_map[key]
-        predict_cache[key] = predict
-        data_map[opunit].append(list(key[1:]) + list(predict))
+    # Sort the records by group and then by the last target in one (stable) pass, so that every group occupies a
+    # contiguous segment of the sorted array
+    group_ids = np.array(group_ids)
+    raw_y = np.array(raw_y_list)
+    order = np.lexsort((raw_y[:, -1], group_ids))
+    raw_y = raw_y[order]
+    group_ids = group_ids[order]
+    _, starts = np.unique(group_ids, return_index=True)
+    ends = np.append(starts[1:], len(raw_y))
+
+    # compute how much to trim
+    len_vecs = ends - starts
+    lows = np.ceil(trim * len_vecs).astype(int)
+    highs = len_vecs - lows
+    bad_bounds = lows >= highs
+
+    # x% trimmed mean of all the groups: sum the [low, high) segments with one reduceat (padding a zero row so that
+    # the segment ends are always valid indices), and divide by the segment lengths
+    segment_bounds = np.stack((starts + lows, starts + highs), axis=1).reshape(-1)
+    padded_y = np.vstack((raw_y, np.zeros((1, raw_y.shape[1]))))
+    segment_sums = np.add.reduceat(padded_y, segment_bounds, axis=0)[::2]
+    predicts = segment_sums / np.maximum(highs - lows, 1)[:, np.newaxis]
+
+    # if bounds are bad, just take the median (of all such groups with one groupby)
+    if bad_bounds.any():
+        bad_rows = bad_bounds[group_ids]
+        medians = pd.DataFrame(raw_y[bad_rows]).groupby(group_ids[bad_rows]).median()
+        predicts[medians.index.values] = medians.values
+
+    keys = list(key_group_map)
+    predict_cache.update(zip(keys, predicts))
+
+    # Expose the singular data point of every group: the features are the key without the opunit, and the outputs
+    # are the predicts, which are split by opunit (in the order that the opunits first appear)
+    opunits = [key[0] for key in keys]
+    opunit_ids = np.array(opunits)
+    x = np.array([key[1:] for key in keys], dtype=np.float64)
 
     data_list = []
-    for opunit, values in data_map.items():
-        np_value = np.array(values)
-        x = np_value[:, :input_output_boundary]
-        y = np_value[:, -data_info.instance.OU_MODEL_TARGET_NUM:]
-        data_list.append(OpUnitData(opunit, x, y))
+    for opunit in dict.fromkeys(opunits):
+        opunit_rows = opunit_ids == opunit
+        data_list.append(OpUnitData(opunit, x[opunit_rows], predicts[opunit_rows]))
 
     return data_list
 
@@ -3,7 +3,6 @@ import argparse
 import pickle
 import logging
 import tqdm
-import random
 from sklearn import model_selection
 
 from . import model
@@ -158,7 +157,9 @@ class InterferenceModelTrainer:
         ou_model_y_pred = []  # The labels directly predicted from the ou models
         raw_y = []  # The actual labels
         data_len = len(impact_data_list)
-        sample_list = random.sample(range(data_len), k=int(data_len * self.impact_model_ratio))
+        # Sample the data positions without replacement, sorted so that the data list is visited in order
+        sample_list = np.sort(np.random.default_rng().choice(data_len, size=int(data_len * self.impact_model_ratio),
+                                                             replace=False))
         epsilon = interference_model_config.RATIO_DIVISION_EPSILON
         # The input feature is (normalized ou model prediction, predicted interference resource util, the predicted
         # resource util on the same core that the opunit group runs)
@@ -101,7 +101,7 @@ class OUModelTrainer:
                     # we omit the data point with the actual label <= 5 when calculating the percentage error (by
                     # essentially giving the data points with small labels a very small weight)
                     evaluate_threshold = 5
-                    weights = np.where(evaluate_y > evaluate_threshold, np.ones(evaluate_y.shape), np.full(evaluate_y.shape, 1e-6))
+                    weights = np.where(evaluate_y > evaluate_threshold, 1.0, 1e-6)
                     percentage_error = np.average(np.abs(evaluate_y - y_pred) / (evaluate_y + error_bias), axis=0,
                                                   weights=weights)
                     results += list(percentage_error) + [""]
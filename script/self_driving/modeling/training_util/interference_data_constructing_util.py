@@ -392,6 +392,7 @@ def _predict_grouped_opunit_data(data_list, ou_model_map, model_results_path, us
         predicted = predicted_pipelines[pipeline]
         total_elapsed_err = total_elapsed_err + (abs(actual - predicted))[-1]
 
+    pipeline_rows = []
     for pipeline in actual_pipelines:
         actual = actual_pipelines[pipeline]
         predicted = predicted_pipelines[pipeline]
@@ -400,12 +401,12 @@ def _predict_grouped_opunit_data(data_list, ou_model_map, model_results_path, us
         ratio_error = abs(actual - predicted) / (actual + 1)
         abs_error = abs(actual - predicted)[-1]
         pabs_error = abs_error / total_elapsed_err
-        io_util.write_csv_result(pipeline_path, pipeline, [num, num * 1.0 / num_pipelines, actual[-1],
-                                                           predicted[-1], ratio_error[-1], abs_error, pabs_error] +
-                                 [""] + list(actual) + [""] + list(predicted) + [""] + list(ratio_error))
+        pipeline_rows.append((pipeline, [num, num * 1.0 / num_pipelines, actual[-1], predicted[-1], ratio_error[-1],
+                                         abs_error, pabs_error] +
+                              [""] + list(actual) + [""] + list(predicted) + [""] + list(ratio_error)))
 
     ratio_error = abs(total_actual - total_predicted) / (total_actual + 1)
-    io_util.write_csv_result(pipeline_path, "Total Pipeline", [num_pipelines, 1, total_actual[-1],
-                                                               total_predicted[-1], ratio_error[-1], total_elapsed_err,
-                                                               1] +
-                             [""] + list(total_actual) + [""] + list(total_predicted) + [""] + list(ratio_error))
+    pipeline_rows.append(("Total Pipeline", [num_pipelines, 1, total_actual[-1], total_predicted[-1], ratio_error[-1],
+                                             total_elapsed_err, 1] +
+                          [""] + list(total_actual) + [""] + list(total_predicted) + [""] + list(ratio_error)))
+    io_util.write_csv_results(pipeline_path, pipeline_rows)
@@ -22,11 +22,8 @@ def record_predictions(pred_results, prediction_path):
     :param prediction_path: the file path to score
     :return:
     """
-    num_data = pred_results[0].shape[0]
-    for i in range(num_data):
-        result_list = (list(pred_results[0][i]) + [""] + list(pred_results[1][i]) + [""]
-                       + list(pred_results[2][i]))
-        io_util.write_csv_result(prediction_path, "", result_list)
+    rows = (("", list(x) + [""] + list(y_pred) + [""] + list(y)) for x, y_pred, y in zip(*pred_results))
+    io_util.write_csv_results(prediction_path, rows)
 
 
 def _get_result_labels(test_only):
@@ -14,6 +14,18 @@ def write_csv_result(path, label, data):
         writer.writerow([label] + list(data))
 
 
+def write_csv_results(path, rows):
+    """Write multiple rows of result data in csv format (opening the file only once)
+
+    :param path: write destination
+    :param rows: iterable of (label, data) pairs, where the label is the first column and the data are the rest columns
+    :return:
+    """
+    with open(path, "a") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerows([label] + list(data) for label, data in rows)
+
+
 def create_csv_file(path, header):
     """Create a new csv file with header (replace any existing one)
 